@@ -6,6 +6,7 @@ import sys
 import re
 from datetime import date
 from typing import Callable, Optional
+from sqlalchemy import insert
 from colorama import Fore, Style, init
 
 # Initialize colorama for colored output
@@ -17,8 +18,37 @@ from models import (
     InvalidSpeedError, InvalidSubscriptionDateError,
     get_db
 )
+from models.customer import validate_email_value, validate_phone_value
+from lib.helpers import (
+    create_customer, list_customers, search_customers,
+    update_customer, delete_customer,
+    create_plan, list_plans, update_plan, delete_plan,
+    invalidate_plan_cache,
+    create_subscription, list_subscriptions,
+    update_subscription, delete_subscription,
+    check_expiring_subscriptions
+)
+
+# Child tables first, so wiping the database never trips a foreign key
+_DELETE_ORDER = list(reversed(Base.metadata.sorted_tables))
+
+# Input kind -> check used by get_valid_input; email and phone reuse the model rules
+_VALIDATORS = {
+    "email": validate_email_value,
+    "phone": validate_phone_value,
+    "router": re.compile(r'^\d{10}$').match,
+    "digits": str.isdigit,
+}
 
 class InternetServiceCLI:
+    # Main menu choice -> submenu method, each run inside its own session
+    _MAIN_DISPATCH = {
+        "1": "customer_menu",
+        "2": "plan_menu",
+        "3": "subscription_menu",
+        "4": "system_tools_menu",
+    }
+
     def __init__(self):
         self.session = None
 
@@ -59,7 +89,8 @@ class InternetServiceCLI:
         response = input(f"{prompt} (y/n): ").strip().lower()
         return response in ('y', 'yes')
 
-    def get_valid_input(self, prompt: str, validator: Callable, error_msg: str, max_attempts=3):
+    def get_valid_input(self, prompt: str, kind: str, error_msg: str, max_attempts=3):
+        validator = _VALIDATORS[kind]
         attempts = 0
         while attempts < max_attempts:
             value = input(prompt).strip()
@@ -81,23 +112,25 @@ class InternetServiceCLI:
         print("5. Exit")
 
         choice = input("> Select option (1-5): ").strip()
-        {
-            "1": lambda: self.execute_with_session(self.customer_menu),
-            "2": lambda: self.execute_with_session(self.plan_menu),
-            "3": lambda: self.execute_with_session(self.subscription_menu),
-            "4": lambda: self.execute_with_session(self.system_tools_menu),
-            "5": self.exit_gracefully
-        }.get(choice, self.invalid_choice)()
+        if choice == "5":
+            self.exit_gracefully()
+        elif choice in self._MAIN_DISPATCH:
+            self.execute_with_session(getattr(self, self._MAIN_DISPATCH[choice]))
+        else:
+            self.invalid_choice()
 
     def invalid_choice(self):
         self.print_error("Invalid selection. Please try again.")
 
     # === Customer Operations ===
     def customer_menu(self):
-        from lib.helpers import (
-            create_customer, list_customers, search_customers,
-            update_customer, delete_customer
-        )
+        actions = {
+            "1": lambda: create_customer(self.session),
+            "2": lambda: list_customers(self.session, True),
+            "3": lambda: search_customers(self.session),
+            "4": lambda: update_customer(self.session),
+            "5": lambda: delete_customer(self.session),
+        }
         while True:
             print("\n📋 CUSTOMER MENU")
             print("1. Add Customer")
@@ -109,20 +142,16 @@ class InternetServiceCLI:
             choice = input("> ").strip()
             if choice == "6":
                 break
-            {
-                "1": lambda: create_customer(self.session),
-                "2": lambda: list_customers(self.session, True),
-                "3": lambda: search_customers(self.session),
-                "4": lambda: update_customer(self.session),
-                "5": lambda: delete_customer(self.session),
-            }.get(choice, self.invalid_choice)()
+            actions.get(choice, self.invalid_choice)()
 
     # === Plan Operations ===
     def plan_menu(self):
-        from lib.helpers import (
-            create_plan, list_plans,
-            update_plan, delete_plan
-        )
+        actions = {
+            "1": lambda: create_plan(self.session),
+            "2": lambda: list_plans(self.session, True),
+            "3": lambda: update_plan(self.session),
+            "4": lambda: delete_plan(self.session),
+        }
         while True:
             print("\n📶 PLAN MENU")
             print("1. Create Plan")
@@ -133,20 +162,17 @@ class InternetServiceCLI:
             choice = input("> ").strip()
             if choice == "5":
                 break
-            {
-                "1": lambda: create_plan(self.session),
-                "2": lambda: list_plans(self.session, True),
-                "3": lambda: update_plan(self.session),
-                "4": lambda: delete_plan(self.session),
-            }.get(choice, self.invalid_choice)()
+            actions.get(choice, self.invalid_choice)()
 
     # === Subscription Operations ===
     def subscription_menu(self):
-        from lib.helpers import (
-            create_subscription, list_subscriptions,
-            update_subscription, delete_subscription,
-            check_expiring_subscriptions
-        )
+        actions = {
+            "1": lambda: create_subscription(self.session),
+            "2": lambda: list_subscriptions(self.session),
+            "3": lambda: update_subscription(self.session),
+            "4": lambda: delete_subscription(self.session),
+            "5": lambda: check_expiring_subscriptions(self.session),
+        }
         while True:
             print("\n🔗 SUBSCRIPTION MENU")
             print("1. Create Subscription")
@@ -158,13 +184,7 @@ class InternetServiceCLI:
             choice = input("> ").strip()
             if choice == "6":
                 break
-            {
-                "1": lambda: create_subscription(self.session),
-                "2": lambda: list_subscriptions(self.session),
-                "3": lambda: update_subscription(self.session),
-                "4": lambda: delete_subscription(self.session),
-                "5": lambda: check_expiring_subscriptions(self.session),
-            }.get(choice, self.invalid_choice)()
+            actions.get(choice, self.invalid_choice)()
 
     # === System Tools ===
     def system_tools_menu(self):
@@ -186,42 +206,53 @@ class InternetServiceCLI:
             fake = Faker()
 
             # Clear all data
-            for table in reversed(Base.metadata.sorted_tables):
+            for table in _DELETE_ORDER:
                 self.session.execute(table.delete())
 
             # Add plans
-            plans = [
-                Plan(name="Basic", speed="10 Mbps", price=2500),
-                Plan(name="Standard", speed="50 Mbps", price=6000),
-                Plan(name="Premium", speed="100 Mbps", price=9999)
+            plan_ids = self.session.scalars(
+                insert(Plan).returning(Plan.id, sort_by_parameter_order=True),
+                [
+                    {"name": "Basic", "speed": "10 Mbps", "price": 2500},
+                    {"name": "Standard", "speed": "50 Mbps", "price": 6000},
+                    {"name": "Premium", "speed": "100 Mbps", "price": 9999}
+                ]
+            ).all()
+
+            # Add customers. Core inserts skip the model validators, so rows
+            # are generated in an already-valid shape.
+            customer_rows = [
+                {
+                    "name": fake.name(),
+                    "email": fake.unique.email().lower(),
+                    "router_id": fake.unique.random_number(digits=10, fix_len=True),
+                    "phone": f"+2547{fake.random_element('0124789')}{fake.random_number(digits=7, fix_len=True)}",
+                    "address": fake.address()
+                }
+                for _ in range(20)
             ]
-            self.session.add_all(plans)
-            self.session.commit()
+            customer_ids = self.session.scalars(
+                insert(Customer).returning(Customer.id, sort_by_parameter_order=True),
+                customer_rows
+            ).all()
 
-            # Add customers and subscriptions
-            for _ in range(20):
-                router_id = fake.unique.uuid4()[:10]  # Generate string router_id
-                cust = Customer(
-                    name=fake.name(),
-                    email=fake.unique.email(),
-                    router_id=router_id,
-                    phone=f"+2547{fake.random_number(digits=8)}",
-                    address=fake.address()
-                )
-                self.session.add(cust)
-                self.session.flush()
-                plan = fake.random_element(plans)
-                self.session.add(
-                    Subscription(
-                        customer_id=cust.id,
-                        plan_id=plan.id,
-                        router_id=router_id,  # Use same string router_id
-                        status=fake.random_element(('active', 'canceled', 'paused')),
-                        start_date=date.today()
-                    )
-                )
+            # Add subscriptions
+            self.session.execute(
+                insert(Subscription),
+                [
+                    {
+                        "customer_id": customer_id,
+                        "plan_id": fake.random_element(plan_ids),
+                        "router_id": row["router_id"],
+                        "status": fake.random_element(('active', 'suspended', 'terminated')),
+                        "start_date": date.today()
+                    }
+                    for customer_id, row in zip(customer_ids, customer_rows)
+                ]
+            )
 
             self.session.commit()
+            invalidate_plan_cache()
             self.print_success("Database seeded with 20 test records")
         except Exception as e:
             self.session.rollback()
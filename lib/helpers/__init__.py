@@ -10,20 +10,24 @@ from .plan_helpers import (
     create_plan,
     list_plans,
     update_plan,
-    delete_plan
+    delete_plan,
+    invalidate_plan_cache
 )
 from .subscription_helpers import (
     create_subscription,
     list_subscriptions,
     update_subscription,
     delete_subscription,
-    check_expiring_subscriptions
+    check_expiring_subscriptions,
+    active_sub_counts
 )
 
 __all__ = [
     'create_customer', 'list_customers', 'search_customers', 
     'update_customer', 'delete_customer',
     'create_plan', 'list_plans', 'update_plan', 'delete_plan',
+    'invalidate_plan_cache',
     'create_subscription', 'list_subscriptions', 'update_subscription',
-    'delete_subscription', 'check_expiring_subscriptions'
+    'delete_subscription', 'check_expiring_subscriptions',
+    'active_sub_counts'
 ]
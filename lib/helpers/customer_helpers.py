@@ -1,6 +1,6 @@
-from datetime import datetime
-from sqlalchemy import or_, String
+from sqlalchemy import or_, func, text
 from lib.models import Customer
+from .subscription_helpers import active_sub_counts
 
 def validate_customer_data(name, email, router_id):
     errors = []
@@ -33,8 +33,7 @@ def create_customer(db):
             email=email,
             phone=phone,
             address=address,
-            router_id=int(router_id),
-            created_at=datetime.now()
+            router_id=int(router_id)
         )
         db.add(customer)
         db.commit()
@@ -44,14 +43,15 @@ def create_customer(db):
         print(f"\n❌ Error creating customer: {str(e)}")
 
 def list_customers(db, detailed=False):
-    customers = db.query(Customer).order_by(Customer.name).all()
+    total = db.query(func.count(Customer.id)).scalar()
     
-    if not customers:
+    if not total:
         print("\nNo customers found")
         return
 
-    print(f"\n📋 Customer List ({len(customers)} total)")
-    for cust in customers:
+    counts = active_sub_counts(db) if detailed else {}
+    print(f"\n📋 Customer List ({total} total)")
+    for cust in db.query(Customer).order_by(Customer.name).yield_per(200):
         if detailed:
             print(f"\nID: {cust.id}")
             print(f"Name: {cust.name}")
@@ -60,30 +60,50 @@ def list_customers(db, detailed=False):
             print(f"Router ID: {cust.router_id}")
             print(f"Address: {cust.address}")
             print(f"Created: {cust.created_at.date()}")
-            print(f"Active Subs: {len([s for s in cust.subscriptions if s.status == 'active'])}")
+            print(f"Active Subs: {counts.get(cust.id, 0)}")
         else:
             print(f"{cust.id}. {cust.name} ({cust.email})")
 
+def has_search_index(db):
+    """Check whether the customers_fts migration has been applied"""
+    return db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'customers_fts'")
+    ).first() is not None
+
 def search_customers(db):
     term = input("\n🔍 Search term: ").strip()
     if not term:
         print("❌ Please enter a search term")
         return
 
-    results = db.query(Customer).filter(
-        or_(
+    if has_search_index(db):
+        # Quote the term so FTS5 treats it as a prefix phrase, not query syntax
+        query = '"' + term.replace('"', '""') + '"*'
+        results = db.query(Customer).from_statement(
+            text(
+                "SELECT customers.* FROM customers "
+                "JOIN customers_fts ON customers_fts.rowid = customers.id "
+                "WHERE customers_fts MATCH :q"
+            )
+        ).params(q=query).all()
+    else:
+        filters = [
             Customer.name.ilike(f"%{term}%"),
-            Customer.email.ilike(f"%{term}%"),
-            Customer.router_id.cast(String).ilike(f"%{term}%")
-        )
-    ).all()
+            Customer.email.ilike(f"%{term}%")
+        ]
+        if term.isdigit() and len(term) <= 10:
+            # Router IDs are 10 digits, so a digit prefix maps to an index-friendly range
+            scale = 10 ** (10 - len(term))
+            filters.append(Customer.router_id.between(int(term) * scale, (int(term) + 1) * scale - 1))
+        results = db.query(Customer).filter(or_(*filters)).all()
 
     if not results:
         print("\nNo matching customers found")
         return
 
     print(f"\n🔍 Found {len(results)} matching customers:")
-    list_customers(db.query(Customer).filter(Customer.id.in_([c.id for c in results])), False)
+    for cust in results:
+        print(f"{cust.id}. {cust.name} ({cust.email})")
 
 def update_customer(db):
     list_customers(db, False)
@@ -112,7 +132,6 @@ def update_customer(db):
         customer.email = new_email
         customer.phone = new_phone
         customer.address = new_address
-        customer.updated_at = datetime.now()
         db.commit()
         print("\n✅ Customer updated successfully!")
     except Exception as e:
@@ -1,5 +1,26 @@
-from datetime import datetime
-from lib.models import Plan
+import time
+from lib.models import Plan, Subscription
+from .subscription_helpers import active_sub_counts
+
+PLAN_CACHE_TTL = 30  # seconds
+_plan_cache = {}
+
+def _get_cached_plans(db):
+    """Return plan rows ordered by price, re-querying at most every PLAN_CACHE_TTL seconds per database"""
+    key = str(db.get_bind().url)
+    cached = _plan_cache.get(key)
+    if cached and time.monotonic() - cached[0] < PLAN_CACHE_TTL:
+        return cached[1]
+    plans = db.query(
+        Plan.id, Plan.name, Plan.speed, Plan.price,
+        Plan.description, Plan.created_at
+    ).order_by(Plan.price).all()
+    _plan_cache[key] = (time.monotonic(), plans)
+    return plans
+
+def invalidate_plan_cache():
+    """Drop cached plan rows after plans are created, changed or removed"""
+    _plan_cache.clear()
 
 def validate_plan_data(name, speed, price):
     """Validate plan input data"""
@@ -36,11 +57,11 @@ def create_plan(db):
             name=name,
             speed=speed,
             description=desc,
-            price=float(price),
-            created_at=datetime.now()
+            price=float(price)
         )
         db.add(plan)
         db.commit()
+        invalidate_plan_cache()
         print(f"\n✅ Plan '{name}' created successfully!")
     except Exception as e:
         db.rollback()
@@ -48,12 +69,13 @@ def create_plan(db):
 
 def list_plans(db, detailed=False):
     """List all available plans"""
-    plans = db.query(Plan).order_by(Plan.price).all()
+    plans = _get_cached_plans(db)
     
     if not plans:
         print("\nNo plans available")
         return
 
+    counts = active_sub_counts(db, Subscription.plan_id) if detailed else {}
     print(f"\n📶 Internet Plans ({len(plans)} total)")
     for plan in plans:
         if detailed:
@@ -63,7 +85,7 @@ def list_plans(db, detailed=False):
             print(f"Price: KES {plan.price:,.2f}")
             print(f"Description: {plan.description or 'N/A'}")
             print(f"Created: {plan.created_at.date()}")
-            print(f"Active Subs: {len(plan.subscriptions)}")
+            print(f"Active Subs: {counts.get(plan.id, 0)}")
         else:
             print(f"{plan.id}. {plan.name} ({plan.speed}) - KES {plan.price:,.2f}")
 
@@ -95,8 +117,8 @@ def update_plan(db):
         plan.speed = new_speed
         plan.description = new_desc
         plan.price = float(new_price)
-        plan.updated_at = datetime.now()
         db.commit()
+        invalidate_plan_cache()
         print("\n✅ Plan updated successfully!")
     except Exception as e:
         db.rollback()
@@ -112,7 +134,7 @@ def delete_plan(db):
         print("❌ Invalid Plan ID")
         return
 
-    if plan.subscriptions:
+    if db.query(Subscription.id).filter_by(plan_id=plan.id).limit(1).first():
         print("❌ Cannot delete - plan has active subscriptions")
         return
 
@@ -124,6 +146,7 @@ def delete_plan(db):
     try:
         db.delete(plan)
         db.commit()
+        invalidate_plan_cache()
         print("\n✅ Plan deleted successfully!")
     except Exception as e:
         db.rollback()
@@ -1,8 +1,12 @@
-from datetime import datetime, date
+from datetime import date
 from dateutil.relativedelta import relativedelta
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, update
+from sqlalchemy.orm import joinedload
 from lib.models import Subscription, Customer, Plan
 
+# Menu choice -> status for update_subscription
+_STATUS_MAP = {'1': 'active', '2': 'suspended', '3': 'terminated'}
+
 def validate_subscription_input(customer_id, plan_id, duration):
     errors = []
     if not customer_id.isdigit():
@@ -13,6 +17,13 @@ def validate_subscription_input(customer_id, plan_id, duration):
         errors.append("Duration must be at least 1 month")
     return errors
 
+def active_sub_counts(db, by=Subscription.customer_id):
+    """Map customer_id (or another column) -> number of active subscriptions in one grouped query"""
+    rows = db.query(by, func.count(Subscription.id)).filter(
+        Subscription.status == 'active'
+    ).group_by(by).all()
+    return dict(rows)
+
 def create_subscription(db):
     print("\n➕ Create New Subscription")
     
@@ -21,10 +32,10 @@ def create_subscription(db):
         print("❌ No customers available")
         return
     
+    counts = active_sub_counts(db)
     print("\nAvailable Customers:")
     for cust in customers:
-        active_subs = len([s for s in cust.subscriptions if s.status == 'active'])
-        print(f"{cust.id}. {cust.name} (Router: {cust.router_id}) - {active_subs} active plans")
+        print(f"{cust.id}. {cust.name} (Router: {cust.router_id}) - {counts.get(cust.id, 0)} active plans")
 
     plans = db.query(Plan).order_by(Plan.price).all()
     if not plans:
@@ -66,8 +77,7 @@ def create_subscription(db):
             router_id=customer.router_id,
             status='active',
             start_date=start_date,
-            end_date=end_date,
-            created_at=datetime.now()
+            end_date=end_date
         )
         db.add(subscription)
         db.commit()
@@ -82,7 +92,11 @@ def create_subscription(db):
         print(f"\n❌ Error creating subscription: {str(e)}")
 
 def list_subscriptions(db, status='active'):
-    query = db.query(Subscription)
+    today = date.today()
+    query = db.query(Subscription).options(
+        joinedload(Subscription.customer),
+        joinedload(Subscription.plan)
+    )
     
     if status == 'active':
         query = query.filter(
@@ -90,7 +104,7 @@ def list_subscriptions(db, status='active'):
                 Subscription.status == 'active',
                 or_(
                     Subscription.end_date == None,
-                    Subscription.end_date >= date.today()
+                    Subscription.end_date >= today
                 )
             )
         )
@@ -98,7 +112,7 @@ def list_subscriptions(db, status='active'):
         query = query.filter(
             and_(
                 Subscription.status == 'active',
-                Subscription.end_date < date.today()
+                Subscription.end_date < today
             )
         )
 
@@ -107,9 +121,9 @@ def list_subscriptions(db, status='active'):
     print(f"\n📋 Subscriptions ({status})")
     print("-" * 60)
     for sub in subscriptions:
-        customer = db.get(Customer, sub.customer_id)
-        plan = db.get(Plan, sub.plan_id)
-        days_left = (sub.end_date - date.today()).days if sub.end_date else None
+        customer = sub.customer
+        plan = sub.plan
+        days_left = sub.days_remaining(today)
         
         print(f"\nID: {sub.id}")
         print(f"Customer: {customer.name} (Router: {sub.router_id})")
@@ -140,10 +154,8 @@ def update_subscription(db):
         print("3. Terminated")
         status_choice = input("New Status (1-3): ").strip()
         
-        status_map = {'1': 'active', '2': 'suspended', '3': 'terminated'}
-        if status_choice in status_map:
-            subscription.status = status_map[status_choice]
-            subscription.updated_at = datetime.now()
+        if status_choice in _STATUS_MAP:
+            subscription.status = _STATUS_MAP[status_choice]
             
             if status_choice == '1' and subscription.end_date and subscription.end_date < date.today():
                 extend = input("Subscription expired. Extend by how many months? (0 to keep expired): ").strip()
@@ -166,7 +178,6 @@ def update_subscription(db):
             return
             
         subscription.end_date += relativedelta(months=int(months))
-        subscription.updated_at = datetime.now()
         db.commit()
         print(f"\n✅ Extended to {subscription.end_date}")
 
@@ -189,7 +200,6 @@ def delete_subscription(db):
 
     try:
         subscription.status = 'terminated'
-        subscription.updated_at = datetime.now()
         db.commit()
         print("\n✅ Subscription cancelled successfully!")
     except Exception as e:
@@ -200,7 +210,10 @@ def check_expiring_subscriptions(db):
     today = date.today()
     deadline = today + relativedelta(days=7)
     
-    expiring = db.query(Subscription).join(Customer).filter(
+    expiring = db.query(Subscription).options(
+        joinedload(Subscription.customer, innerjoin=True),
+        joinedload(Subscription.plan)
+    ).filter(
         and_(
             Subscription.status == 'active',
             Subscription.end_date.between(today, deadline),
@@ -216,6 +229,7 @@ def check_expiring_subscriptions(db):
         return
 
     print(f"\n🔔 Found {len(expiring)} subscriptions needing reminders:")
+    reminded = []
     for sub in expiring:
         customer = sub.customer
         plan = sub.plan
@@ -225,9 +239,18 @@ def check_expiring_subscriptions(db):
         if customer.email:
             print(f"  Email: {customer.email}")
             print("  [Email reminder would be sent here]")
-            sub.last_reminder_sent = today
+            reminded.append(sub)
         else:
             print("  ❌ No email on file - cannot send reminder")
     
+    if reminded:
+        db.execute(
+            update(Subscription)
+            .where(Subscription.id.in_([sub.id for sub in reminded]))
+            .values(last_reminder_sent=today)
+        )
     db.commit()
+    # The bulk UPDATE set updated_at in the database only; reload it on next access
+    for sub in reminded:
+        db.expire(sub, ['updated_at'])
     print("\n✅ Reminder flags updated")
@@ -22,6 +22,13 @@ if config.config_file_name is not None:
 from lib.models.database import Base
 target_metadata = Base.metadata
 
+# customers_fts and its shadow tables are created by a hand-written
+# migration, not the models; keep autogenerate from dropping them
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not name.startswith("customers_fts")
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -45,6 +52,7 @@ def run_migrations_offline() -> None:
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
+        include_name=include_name,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -67,7 +75,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,55 @@
+"""Add customers_fts search index
+
+Revision ID: 542af9196f14
+Revises: 914d42c31c9f
+Create Date: 2026-10-14 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '542af9196f14'
+down_revision: Union[str, None] = '914d42c31c9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # External-content FTS5 index over customers, kept in sync by triggers
+    op.execute(
+        "CREATE VIRTUAL TABLE customers_fts USING fts5("
+        "name, email, router_id, content='customers', content_rowid='id')"
+    )
+    op.execute(
+        "CREATE TRIGGER customers_fts_ai AFTER INSERT ON customers BEGIN "
+        "INSERT INTO customers_fts(rowid, name, email, router_id) "
+        "VALUES (new.id, new.name, new.email, new.router_id); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER customers_fts_ad AFTER DELETE ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, name, email, router_id) "
+        "VALUES ('delete', old.id, old.name, old.email, old.router_id); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER customers_fts_au AFTER UPDATE ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, name, email, router_id) "
+        "VALUES ('delete', old.id, old.name, old.email, old.router_id); "
+        "INSERT INTO customers_fts(rowid, name, email, router_id) "
+        "VALUES (new.id, new.name, new.email, new.router_id); "
+        "END"
+    )
+    # Index customers that already exist
+    op.execute("INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_ai")
+    op.execute("DROP TABLE IF EXISTS customers_fts")
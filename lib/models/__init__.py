@@ -3,14 +3,14 @@ Models package initialization.
 Exports all models and exceptions for convenient importing.
 """
 
-from .database import Base, engine, get_db
+from .database import Base, get_engine, get_db
 from .customer import Customer, InvalidEmailError, InvalidPhoneError
 from .plan import Plan, InvalidSpeedError
-from .subscription import Subscription, InvalidSubscriptionDateError
+from .subscription import Subscription, InvalidSubscriptionDateError, InvalidSubscriptionStatusError
 
 __all__ = [
     'Base', 
-    'engine', 
+    'get_engine',
     'get_db',
     'Customer', 
     'Plan', 
@@ -18,5 +18,6 @@ __all__ = [
     'InvalidEmailError',
     'InvalidPhoneError',
     'InvalidSpeedError',
-    'InvalidSubscriptionDateError'
+    'InvalidSubscriptionDateError',
+    'InvalidSubscriptionStatusError'
 ]
\ No newline at end of file
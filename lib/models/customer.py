@@ -8,6 +8,10 @@ from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 import re
 
+_EMAIL_RE = re.compile(r'^[^@]+@[^@]+\.[^@]+$')
+_PHONE_CLEAN_RE = re.compile(r'[^\d+]')
+_PHONE_RE = re.compile(r'^\+2547[0-247-9]\d{7}$')
+
 class InvalidEmailError(ValueError):
     """Raised when email validation fails."""
     pass
@@ -16,6 +20,23 @@ class InvalidPhoneError(ValueError):
     """Raised when phone number validation fails."""
     pass
 
+def validate_email_value(email):
+    """Return the normalized email, or raise InvalidEmailError."""
+    if not _EMAIL_RE.match(email):
+        raise InvalidEmailError("Invalid email format")
+    return email.lower().strip()
+
+def validate_phone_value(phone):
+    """Return the phone in +2547XXXXXXXX form (None if empty), or raise InvalidPhoneError."""
+    if not phone:
+        return None
+    cleaned = _PHONE_CLEAN_RE.sub('', phone)
+    if cleaned.startswith('0') and len(cleaned) == 10:
+        cleaned = '+254' + cleaned[1:]
+    if not _PHONE_RE.match(cleaned):
+        raise InvalidPhoneError("Invalid Kenyan phone. Use +2547XXXXXXXX or 07XXXXXXXX")
+    return cleaned
+
 class Customer(Base):
     __tablename__ = "customers"
     __table_args__ = (
@@ -37,7 +58,7 @@ class Customer(Base):
         "Subscription", 
         back_populates="customer",
         cascade="all, delete-orphan",
-        lazy="dynamic"
+        lazy="select"
     )
     
     def __str__(self):
@@ -45,20 +66,11 @@ class Customer(Base):
     
     @validates('email')
     def validate_email(self, key, email):
-        if not re.match(r'^[^@]+@[^@]+\.[^@]+$', email):
-            raise InvalidEmailError("Invalid email format")
-        return email.lower().strip()
+        return validate_email_value(email)
     
     @validates('phone')
     def validate_phone(self, key, phone):
-        if not phone:
-            return None
-        cleaned = re.sub(r'[^\d+]', '', phone)
-        if cleaned.startswith('0') and len(cleaned) == 10:
-            cleaned = '+254' + cleaned[1:]
-        if not re.match(r'^\+2547[0-247-9]\d{7}$', cleaned):
-            raise InvalidPhoneError("Invalid Kenyan phone. Use +2547XXXXXXXX or 07XXXXXXXX")
-        return cleaned
+        return validate_phone_value(phone)
 
     def __repr__(self):
         return (
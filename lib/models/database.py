@@ -7,46 +7,72 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlite3 import Connection as SQLite3Connection
 from contextlib import contextmanager
+from functools import lru_cache, partial
 from sqlalchemy import event
 import os
 
-# Determine environment and database URL
-TESTING = os.getenv("TESTING", "False").lower() == "true"
-DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
-    "sqlite:///test.db" if TESTING else "sqlite:///internet_service.db"
-)
+# Determine environment and database URL (read when the engine is first built)
+def _is_testing():
+    return os.getenv("TESTING", "False").lower() == "true"
 
-# Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    pool_pre_ping=True,
-    echo=True  # Set to False in production
-)
+def _database_url():
+    return os.getenv(
+        "DATABASE_URL", 
+        "sqlite:///test.db" if _is_testing() else "sqlite:///internet_service.db"
+    )
 
 # Enable foreign keys for SQLite
-@event.listens_for(engine, "connect")
-def enable_foreign_keys(dbapi_connection, connection_record):
+def enable_foreign_keys(dbapi_connection, connection_record, testing=False):
     if isinstance(dbapi_connection, SQLite3Connection):
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.execute("PRAGMA journal_mode=WAL")
+        if testing:
+            # Test databases are disposable, so skip durability entirely
+            cursor.execute("PRAGMA journal_mode=MEMORY")
+            cursor.execute("PRAGMA synchronous=OFF")
+        else:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL can only lose the last transaction on power loss, never corrupt
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.execute("PRAGMA wal_autocheckpoint=10000")
         cursor.close()
 
+def _build_engine(url):
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_pre_ping=True,
+        echo=os.getenv("SQL_ECHO", "0") == "1"  # Set SQL_ECHO=1 to log statements
+    )
+    # Testing-ness is fixed per engine rather than re-read on every connect
+    event.listen(engine, "connect", partial(enable_foreign_keys, testing=_is_testing()))
+    return engine
+
+# One engine per resolved URL for the life of the process
+@lru_cache(maxsize=None)
+def _engine_for(url):
+    return _build_engine(url)
+
+# None means the configured URL, so get_engine() and get_db() share one engine
+def get_engine(url=None):
+    return _engine_for(url or _database_url())
+
 # ORM base and session
 Base = declarative_base()
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine
+    expire_on_commit=False
 )
 
-# Context manager for session
+# Context manager for session; pass url to use a database other than the configured one
 @contextmanager
-def get_db():
-    db = SessionLocal()
+def get_db(url=None):
+    db = SessionLocal(bind=get_engine(url))
     try:
         yield db
     finally:
@@ -8,10 +8,18 @@ from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 import re
 
+_SPEED_RE = re.compile(r'^\d+\s?(?:Mbps|Gbps)$', re.IGNORECASE)
+
 class InvalidSpeedError(ValueError):
     """Raised when speed format is invalid."""
     pass
 
+def validate_speed_value(speed):
+    """Return the stripped speed, or raise InvalidSpeedError."""
+    if not _SPEED_RE.match(speed):
+        raise InvalidSpeedError("Speed must be like '10 Mbps' or '1 Gbps'")
+    return speed.strip()
+
 class Plan(Base):
     __tablename__ = "plans"
     __table_args__ = (
@@ -33,7 +41,7 @@ class Plan(Base):
     subscriptions = relationship(
         "Subscription", 
         back_populates="plan",
-        lazy="dynamic"
+        lazy="select"
     )
 
     def __str__(self):
@@ -41,9 +49,7 @@ class Plan(Base):
     
     @validates('speed')
     def validate_speed(self, key, speed):
-        if not re.match(r'^\d+\s?(Mbps|Gbps)$', speed, re.IGNORECASE):
-            raise InvalidSpeedError("Speed must be like '10 Mbps' or '1 Gbps'")
-        return speed.strip()
+        return validate_speed_value(speed)
     
     @validates('name')
     def validate_name(self, key, name):
@@ -8,10 +8,38 @@ from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 import datetime
 
+# Mirrors the valid_status CHECK constraint so bad values fail before a flush
+_VALID_STATUSES = frozenset({'active', 'suspended', 'terminated', 'expired'})
+
+_STATUS_ICON = {
+    'active': '✓',
+    'suspended': '⚠',
+    'terminated': '✗',
+    'expired': '⌛'
+}
+
 class InvalidSubscriptionDateError(ValueError):
     """Raised when subscription dates are invalid."""
     pass
 
+class InvalidSubscriptionStatusError(ValueError):
+    """Raised when subscription status is not one of the allowed values."""
+    pass
+
+def validate_start_date_value(start_date):
+    """Return start_date, or raise InvalidSubscriptionDateError if it is in the past."""
+    if start_date < datetime.date.today():
+        raise InvalidSubscriptionDateError("Start date cannot be in the past")
+    return start_date
+
+def validate_status_value(status):
+    """Return status, or raise InvalidSubscriptionStatusError if it is not allowed."""
+    if status not in _VALID_STATUSES:
+        raise InvalidSubscriptionStatusError(
+            f"Invalid status '{status}'. Use one of: {', '.join(sorted(_VALID_STATUSES))}"
+        )
+    return status
+
 class Subscription(Base):
     __tablename__ = "subscriptions"
     __table_args__ = (
@@ -20,6 +48,7 @@ class Subscription(Base):
         CheckConstraint("router_id BETWEEN 1000000000 AND 9999999999", name="valid_router_id"),
         Index('ix_subscriptions_router_id', 'router_id', unique=True),
         Index('ix_subscriptions_status', 'status'),
+        Index('ix_sub_expiry', 'status', 'end_date', 'last_reminder_sent'),
         {'sqlite_autoincrement': True}
     )
 
@@ -38,12 +67,7 @@ class Subscription(Base):
     plan = relationship("Plan", back_populates="subscriptions")
 
     def __str__(self):
-        status_icon = {
-            'active': '✓',
-            'suspended': '⚠',
-            'terminated': '✗',
-            'expired': '⌛'
-        }.get(self.status, '?')
+        status_icon = _STATUS_ICON.get(self.status, '?')
         
         return (
             f"{status_icon} Subscription #{self.id} - "
@@ -53,21 +77,23 @@ class Subscription(Base):
     
     @validates('start_date')
     def validate_start_date(self, key, start_date):
-        if start_date < datetime.date.today():
-            raise InvalidSubscriptionDateError("Start date cannot be in the past")
-        return start_date
+        return validate_start_date_value(start_date)
+    
+    @validates('status')
+    def validate_status(self, key, status):
+        return validate_status_value(status)
     
-    def is_active(self):
-        today = datetime.date.today()
+    def is_active(self, today=None):
+        today = today or datetime.date.today()
         return (
             self.status == 'active' and 
             (self.end_date is None or self.end_date >= today)
         )
     
-    def days_remaining(self):
+    def days_remaining(self, today=None):
         if not self.end_date:
             return None
-        return (self.end_date - datetime.date.today()).days
+        return (self.end_date - (today or datetime.date.today())).days
     
     def __repr__(self):
         return (
@@ -1,42 +1,67 @@
+import random
 from faker import Faker
+from sqlalchemy import insert, select, func
 from models import Customer, Plan, Subscription, get_db
+from models.customer import validate_email_value, validate_phone_value
+from models.plan import validate_speed_value
+from models.subscription import validate_status_value
 
 fake = Faker()
 
+def _next_id(db, model):
+    """First free primary key, so rows can carry explicit ids into an executemany"""
+    return db.scalar(select(func.coalesce(func.max(model.id), 0))) + 1
+
+def _router_id(customer_id):
+    """Deterministic 10-digit router ID, unique per customer id"""
+    return 10**9 + customer_id
+
 def seed_database(record_count=10):
     with get_db() as db:
+        # Core inserts skip @validates, so checked columns go through the model validators
         # Create Plans
-        plans = [
-            Plan(name="Basic", speed="10 Mbps", price=2500),
-            Plan(name="Premium", speed="100 Mbps", price=9999)
-        ]
-        db.add_all(plans)
-        db.commit()
+        first_plan = _next_id(db, Plan)
+        plan_ids = [first_plan, first_plan + 1]
+        db.execute(
+            insert(Plan),
+            [
+                {"id": plan_ids[0], "name": "Basic", "speed": validate_speed_value("10 Mbps"), "price": 2500},
+                {"id": plan_ids[1], "name": "Premium", "speed": validate_speed_value("100 Mbps"), "price": 9999}
+            ]
+        )
 
         # Create Customers
-        customers = []
-        for _ in range(record_count):
-            customers.append(
-                Customer(
-                    name=fake.name(),
-                    email=fake.unique.email(),
-                    router_id=fake.unique.random_number(digits=10),
-                    phone=f"+2547{fake.random_number(digits=8)}"
-                )
-            )
-        db.add_all(customers)
-        db.commit()
+        first_customer = _next_id(db, Customer)
+        customer_ids = range(first_customer, first_customer + record_count)
+        name_fn = fake.name  # bound once instead of per row
+        db.execute(
+            insert(Customer),
+            [
+                {
+                    "id": customer_id,
+                    "name": name_fn(),
+                    "email": validate_email_value(f"user{customer_id}@example.com"),
+                    "router_id": _router_id(customer_id),
+                    "phone": validate_phone_value(f"+254712{customer_id:06d}")
+                }
+                for customer_id in customer_ids
+            ]
+        )
 
         # Create Subscriptions
-        for customer in customers:
-            db.add(
-                Subscription(
-                    customer_id=customer.id,
-                    plan_id=fake.random_element(plans).id,
-                    router_id=fake.unique.random_number(digits=10),
-                    status="active"
-                )
-            )
+        plan_picks = random.choices(plan_ids, k=record_count)
+        db.execute(
+            insert(Subscription),
+            [
+                {
+                    "customer_id": customer_id,
+                    "plan_id": plan_id,
+                    "router_id": _router_id(customer_id),
+                    "status": validate_status_value("active")
+                }
+                for customer_id, plan_id in zip(customer_ids, plan_picks)
+            ]
+        )
         db.commit()
 
 if __name__ == "__main__":